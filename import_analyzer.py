@@ -1,126 +1,302 @@
 import argparse
 import ast
+import functools
 import importlib
 import importlib.util
+import json
+import os
+import site
 import sys
-import time
 from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
-from typing import Dict, List, Set, Tuple, Union
+from typing import TYPE_CHECKING, Any, Dict, FrozenSet, Iterator, List, Optional, Set, Tuple
+
+import numpy as np
+
+from import_visitor import collect_imports
+from load_time_analyzer import time_imports
+from module_stats import ModuleStats
+from optimizer import suggest_optimizations
+from visualizer import compute_layout
+
+if TYPE_CHECKING:
+    import networkx as nx
+
+SKIP_DIRS = frozenset(
+    {
+        "venv",
+        ".venv",
+        "env",
+        "__pycache__",
+        "tests",
+        ".tox",
+        ".eggs",
+        "build",
+        "dist",
+        ".git",
+        ".env",
+        "node_modules",
+    }
+)
+
+_STDLIB = set(sys.stdlib_module_names) | set(sys.builtin_module_names)
+
+
+def _site_packages_modules() -> FrozenSet[str]:
+    modules = set()
+    for site_dir in site.getsitepackages() + [site.getusersitepackages()]:
+        try:
+            with os.scandir(site_dir) as entries:
+                for entry in entries:
+                    if not entry.name.endswith((".dist-info", ".egg-info", ".pth")):
+                        modules.add(entry.name.partition(".")[0])
+        except OSError:
+            pass
+    return frozenset(modules)
+
+
+_THIRD_PARTY = _site_packages_modules()
+
+
+@functools.lru_cache(maxsize=None)
+def _get_import_type(module_name: str) -> str:
+    if module_name in _STDLIB:
+        return "stdlib"
+    if module_name in _THIRD_PARTY:
+        return "third-party"
+    spec = importlib.util.find_spec(module_name)
+    if spec is None:
+        return "local"
+    if "site-packages" in str(spec.origin):
+        return "third-party"
+    return "stdlib"
 
-import matplotlib.pyplot as plt
-import networkx as nx
 
-from import_visitor import ImportVisitor
+def get_module_name(filepath: Path, project_root: Path) -> str:
+    return ".".join(filepath.relative_to(project_root).with_suffix("").parts)
+
+
+def parse_file(filepath: Path, project_root: Path) -> Tuple[str, Optional[List[str]]]:
+    module_name = get_module_name(filepath, project_root)
+    try:
+        tree = ast.parse(filepath.read_bytes(), filename=str(filepath))
+        return module_name, sorted(collect_imports(tree))
+
+    except Exception as e:
+        print(f"Error analyzing {filepath}: {e}")
+        return module_name, None
 
 
 class ImportAnalyzer:
     def __init__(self, project_root: str):
         self.project_root = Path(project_root)
         self.import_graph: Dict[str, Set[Tuple[str, str]]] = defaultdict(set)
-        self.module_stats: Dict[str, Dict[str, Union[int, float]]] = defaultdict(
-            lambda: {"imports": 0, "imported_by": 0, "import_time": 0.0}
-        )
+        self.module_stats: Dict[str, ModuleStats] = defaultdict(ModuleStats)
+        self._cache_path = self.project_root / ".importo_cache.json"
 
     def analyze_project(self) -> None:
-        for py_file in self.project_root.rglob("*.py"):
-            if self._should_skip_file(py_file):
-                continue
-            self._analyze_file(py_file)
-
-    def _should_skip_file(self, filepath: Path) -> bool:
-        skip_patterns = {
-            "venv",
-            "env",
-            "__pycache__",
-            "tests",
-            "test_",
-            ".tox",
-            ".eggs",
-            "build",
-            "dist",
-            ".git",
-            ".env",
-        }
-        skip_extensions = {".json", ".js", ".css", ".html"}
+        self.__dict__.pop("nx_graph", None)
+        self.__dict__.pop("layout", None)
+        if not self.project_root.is_dir():
+            print(f"Project root {self.project_root} is not a directory")
+            return
 
-        return (
-            any(pattern in str(filepath) for pattern in skip_patterns)
-            or filepath.suffix in skip_extensions
-        )
+        cache = self._load_cache()
+        new_cache: Dict[str, List[Any]] = {}
+        pending = []
 
-    def _analyze_file(self, filepath: Path) -> None:
-        try:
-            with open(filepath, "r", encoding="utf-8") as f:
-                tree = ast.parse(f.read())
-
-            module_name = self._get_module_name(filepath)
-            visitor = ImportVisitor()
-            visitor.visit(tree)
-
-            for imported_module in visitor.imports:
-                import_type = self._get_import_type(imported_module)
-                self.import_graph[module_name].add((imported_module, import_type))
-                self.module_stats[module_name]["imports"] += 1
-                self.module_stats[imported_module]["imported_by"] += 1
-                self.module_stats[module_name][f"{import_type}_imports"] = (
-                    self.module_stats[module_name].get(f"{import_type}_imports", 0) + 1
+        for py_file in self._iter_python_files():
+            try:
+                st = py_file.stat()
+            except OSError as e:
+                print(f"Error analyzing {py_file}: {e}")
+                continue
+            key = str(py_file)
+            cached = cache.get(key)
+            if cached is not None and cached[:2] == [st.st_mtime_ns, st.st_size]:
+                new_cache[key] = cached
+                self._add_imports(*cached[2])
+            else:
+                pending.append((py_file, st))
+
+        if pending:
+            files = [py_file for py_file, _ in pending]
+            cpu_count = os.cpu_count() or 1
+            chunksize = max(1, len(files) // (4 * cpu_count))
+            with ProcessPoolExecutor() as executor:
+                results = executor.map(
+                    parse_file, files, [self.project_root] * len(files), chunksize=chunksize
                 )
+                for (py_file, st), result in zip(pending, results):
+                    if result[1] is not None:
+                        new_cache[str(py_file)] = [st.st_mtime_ns, st.st_size, result]
+                    self._add_imports(*result)
+
+        if pending or len(new_cache) != len(cache):
+            self._save_cache(new_cache)
+
+    def _add_imports(self, module_name: str, imports: Optional[List[str]]) -> None:
+        # Classified here rather than cached: the import type depends on the environment
+        for imported_module in imports or ():
+            import_type = _get_import_type(imported_module)
+            self.import_graph[module_name].add((imported_module, import_type))
+            stats = self.module_stats[module_name]
+            stats.imports += 1
+            if import_type == "stdlib":
+                stats.stdlib_imports += 1
+            elif import_type == "third-party":
+                stats.third_party_imports += 1
+            else:
+                stats.local_imports += 1
+            self.module_stats[imported_module].imported_by += 1
+
+    def _load_cache(self) -> Dict[str, List[Any]]:
+        # Plain JSON rather than pickle: the cache lives inside the analyzed tree
+        # and must never be able to run code when loaded
+        try:
+            with open(self._cache_path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return {}
+        if not isinstance(data, dict):
+            return {}
+        return {
+            key: entry
+            for key, entry in data.items()
+            if isinstance(entry, list)
+            and len(entry) == 3
+            and isinstance(entry[2], list)
+            and len(entry[2]) == 2
+            and isinstance(entry[2][1], list)
+            and all(isinstance(name, str) for name in entry[2][1])
+        }
 
-        except Exception as e:
-            print(f"Error analyzing {filepath}: {e}")
-
-    def _get_module_name(self, filepath: Path) -> str:
-        relative_path = filepath.relative_to(self.project_root)
-        return str(relative_path.with_suffix("")).replace("/", ".")
-
-    def _get_import_type(self, module_name: str) -> str:
-        if module_name in sys.builtin_module_names:
-            return "stdlib"
-        spec = importlib.util.find_spec(module_name)
-        if spec is None:
-            return "local"
-        if "site-packages" in str(spec.origin):
-            return "third-party"
-        return "stdlib"
+    def _save_cache(self, cache: Dict[str, List[Any]]) -> None:
+        try:
+            with open(self._cache_path, "w", encoding="utf-8") as f:
+                json.dump(cache, f)
+        except OSError as e:
+            print(f"Could not write cache {self._cache_path}: {e}")
+
+    def _iter_python_files(self) -> Iterator[Path]:
+        stack = [self.project_root]
+        while stack:
+            directory = stack.pop()
+            try:
+                with os.scandir(directory) as entries:
+                    for entry in entries:
+                        if entry.is_dir(follow_symlinks=False):
+                            # Virtualenvs come in many names (.venv, myvenv, venv-3.11, ...)
+                            if entry.name not in SKIP_DIRS and "venv" not in entry.name:
+                                stack.append(Path(entry.path))
+                        elif entry.name.endswith(".py") and not entry.name.startswith("test_"):
+                            yield Path(entry.path)
+            except OSError as e:
+                print(f"Could not read directory {directory}: {e}")
+
+    @functools.cached_property
+    def nx_graph(self) -> "nx.DiGraph":
+        import networkx as nx
 
-    def get_circular_dependencies(self) -> List[List[str]]:
-        def find_cycles(node: str, path: List[str], visited: Set[str]) -> List[List[str]]:
-            if node in path:
-                cycle_start = path.index(node)
-                return [path[cycle_start:]]
+        G = nx.DiGraph()
+        G.add_nodes_from(self.import_graph)
+        G.add_edges_from(
+            (module, imported_module, {"type": import_type})
+            for module, imports in self.import_graph.items()
+            for imported_module, import_type in imports
+        )
+        return G
 
-            cycles: List[List[str]] = []
-            if node in visited:
-                return cycles
+    @functools.cached_property
+    def layout(self) -> Dict[str, Tuple[float, float]]:
+        return compute_layout(self.nx_graph)
 
-            visited.add(node)
-            path.append(node)
+    def _build_csr(self) -> Tuple[np.ndarray, np.ndarray, Dict[str, int]]:
+        name_to_id: Dict[str, int] = {}
+        for module, imports in self.import_graph.items():
+            name_to_id.setdefault(module, len(name_to_id))
+            for imported_module, _ in imports:
+                name_to_id.setdefault(imported_module, len(name_to_id))
 
-            for neighbor, _ in self.import_graph[node]:
-                cycles.extend(find_cycles(neighbor, path.copy(), visited))
+        indptr = np.zeros(len(name_to_id) + 1, dtype=np.int32)
+        for module, imports in self.import_graph.items():
+            indptr[name_to_id[module] + 1] = len(imports)
+        np.cumsum(indptr, out=indptr)
 
-            return cycles
+        indices = np.empty(indptr[-1], dtype=np.int32)
+        for module, imports in self.import_graph.items():
+            start = indptr[name_to_id[module]]
+            indices[start : start + len(imports)] = [name_to_id[m] for m, _ in imports]
 
-        all_cycles = []
-        visited: Set[str] = set()
+        return indptr, indices, name_to_id
 
-        for node in self.import_graph:
-            cycles = find_cycles(node, [], visited)
-            all_cycles.extend(cycles)
+    def get_circular_dependencies(self) -> List[List[str]]:
+        import networkx as nx
+
+        from scc import HAVE_NUMBA, tarjan_scc
+
+        G = self.nx_graph
+        if HAVE_NUMBA:
+            indptr, indices, name_to_id = self._build_csr()
+            comp_id = tarjan_scc(indptr, indices)
+
+            names = list(name_to_id)
+            by_comp: Dict[int, List[str]] = defaultdict(list)
+            for node_id in np.flatnonzero(np.bincount(comp_id)[comp_id] > 1):
+                by_comp[comp_id[node_id]].append(names[node_id])
+            components = list(by_comp.values())
+        else:
+            # Without numba the pure-Python Tarjan is slower than networkx's own SCC pass
+            components = [scc for scc in nx.strongly_connected_components(G) if len(scc) > 1]
+
+        # A module importing itself is a one-node component with a self-edge
+        in_components = set().union(*components)
+        components.extend(
+            [node] for node in nx.nodes_with_selfloops(G) if node not in in_components
+        )
 
-        return all_cycles
+        cycles: List[List[str]] = []
+        for members in components:
+            cycles.extend(nx.simple_cycles(G.subgraph(members)))
+        return cycles
 
-    def get_import_statistics(self) -> Dict[str, Dict]:
+    def find_cycle(self) -> Optional[List[str]]:
+        visited: Set[str] = set()
+        for start in self.import_graph:
+            if start in visited:
+                continue
+            visited.add(start)
+            path = [start]
+            on_path = {start}
+            stack = [iter(self.import_graph[start])]
+            while stack:
+                for neighbor, _ in stack[-1]:
+                    if neighbor in on_path:
+                        return path[path.index(neighbor) :]
+                    if neighbor not in visited:
+                        visited.add(neighbor)
+                        on_path.add(neighbor)
+                        path.append(neighbor)
+                        stack.append(iter(self.import_graph.get(neighbor, ())))
+                        break
+                else:
+                    on_path.discard(path.pop())
+                    stack.pop()
+        return None
+
+    def has_cycle(self) -> bool:
+        return self.find_cycle() is not None
+
+    def get_import_statistics(self) -> Dict[str, ModuleStats]:
         return dict(self.module_stats)
 
     def visualize_dependency_graph(self, output_file: str = "dependency_graph.png") -> None:
-        G = nx.DiGraph()
-        for module, imports in self.import_graph.items():
-            for imported_module, import_type in imports:
-                G.add_edge(module, imported_module, type=import_type)
+        import matplotlib.pyplot as plt
+        import networkx as nx
 
-        pos = nx.spring_layout(G)
+        G = self.nx_graph
+        pos = self.layout
         plt.figure(figsize=(20, 20))
         nx.draw(
             G,
@@ -134,9 +310,12 @@ class ImportAnalyzer:
         )
 
         edge_colors = {"stdlib": "green", "third-party": "red", "local": "blue"}
+        edges_by_type: Dict[str, List[Tuple[str, str]]] = defaultdict(list)
         for u, v, d in G.edges(data=True):
+            edges_by_type[d["type"]].append((u, v))
+        for import_type, edgelist in edges_by_type.items():
             nx.draw_networkx_edges(
-                G, pos, edgelist=[(u, v)], edge_color=edge_colors[d["type"]], arrows=True
+                G, pos, edgelist=edgelist, edge_color=edge_colors[import_type], arrows=True
             )
 
         plt.title("Project Dependency Graph")
@@ -146,71 +325,15 @@ class ImportAnalyzer:
         plt.close()
 
     def suggest_optimizations(self) -> List[str]:
-        suggestions = []
-
-        heavy_importers = {
-            module: stats["imports"]
-            for module, stats in self.module_stats.items()
-            if stats["imports"] > 10
-        }
-
-        if heavy_importers:
-            suggestions.append("Modules with many imports (consider refactoring):")
-            for module, count in sorted(heavy_importers.items(), key=lambda x: x[1], reverse=True):
-                suggestions.append(f"  - {module}: {count} imports")
-
-        common_imports = {
-            module: stats["imported_by"]
-            for module, stats in self.module_stats.items()
-            if stats["imported_by"] > 5
-        }
-
-        if common_imports:
-            suggestions.append("\nFrequently imported modules (consider lazy loading):")
-            for module, count in sorted(common_imports.items(), key=lambda x: x[1], reverse=True):
-                suggestions.append(f"  - {module}: imported by {count} modules")
-
-        third_party_imports = {
-            module: stats.get("third-party_imports", 0)
-            for module, stats in self.module_stats.items()
-            if stats.get("third-party_imports", 0) > 3
-        }
-
-        if third_party_imports:
-            suggestions.append("\nConsider centralizing these frequently used third-party imports:")
-            for module, count in sorted(
-                third_party_imports.items(), key=lambda x: x[1], reverse=True
-            )[:5]:
-                suggestions.append(f"  - {module}: {count} third-party imports")
-
-        local_importers = {
-            module: stats.get("local_imports", 0)
-            for module, stats in self.module_stats.items()
-            if stats.get("local_imports", 0) > 5
-        }
-
-        if local_importers:
-            suggestions.append("\nConsider using __all__ to limit exported names in these modules:")
-            for module, count in sorted(local_importers.items(), key=lambda x: x[1], reverse=True)[
-                :5
-            ]:
-                suggestions.append(f"  - {module}: {count} local imports")
-
-        return suggestions
+        return suggest_optimizations(self.module_stats)
 
     def analyze_import_load_times(self) -> None:
-        for module in self.import_graph.keys():
-            start_time = time.time()
-            try:
-                importlib.import_module(module)
-                load_time = time.time() - start_time
-                self.module_stats[module]["import_time"] = load_time
-            except ImportError:
-                print(f"Could not import {module} for load time analysis")
+        for module, load_time in time_imports(list(self.import_graph), str(self.project_root)):
+            self.module_stats[module].import_time = load_time
 
     def get_top_import_times(self, top_n: int = 10) -> List[Tuple[str, float]]:
         return sorted(
-            [(module, stats["import_time"]) for module, stats in self.module_stats.items()],
+            [(module, stats.import_time) for module, stats in self.module_stats.items()],
             key=lambda x: x[1],
             reverse=True,
         )[:top_n]
@@ -228,28 +351,30 @@ def main():
     analyzer = ImportAnalyzer(args.project_root)
     analyzer.analyze_project()
 
-    print("Import Statistics:")
+    lines = ["Import Statistics:"]
     for module, stats in analyzer.get_import_statistics().items():
-        print(f"{module}:")
-        print(f"  Imports: {stats['imports']}")
-        print(f"  Imported by: {stats['imported_by']}")
-        print(f"  Stdlib imports: {stats.get('stdlib_imports', 0)}")
-        print(f"  Third-party imports: {stats.get('third-party_imports', 0)}")
-        print(f"  Local imports: {stats.get('local_imports', 0)}")
-
-    print("\nOptimization Suggestions:")
-    for suggestion in analyzer.suggest_optimizations():
-        print(suggestion)
+        lines.append(f"{module}:")
+        lines.append(f"  Imports: {stats.imports}")
+        lines.append(f"  Imported by: {stats.imported_by}")
+        lines.append(f"  Stdlib imports: {stats.stdlib_imports}")
+        lines.append(f"  Third-party imports: {stats.third_party_imports}")
+        lines.append(f"  Local imports: {stats.local_imports}")
+
+    lines.append("\nOptimization Suggestions:")
+    lines.extend(analyzer.suggest_optimizations())
+    # Write the report before the slow optional steps so a failure there doesn't lose it
+    sys.stdout.write("\n".join(lines) + "\n")
 
     if args.visualize:
         analyzer.visualize_dependency_graph()
-        print("\nDependency graph saved as 'dependency_graph.png'")
+        sys.stdout.write("\nDependency graph saved as 'dependency_graph.png'\n")
 
     if args.load_times:
         analyzer.analyze_import_load_times()
-        print("\nTop 10 modules by import time:")
+        lines = ["\nTop 10 modules by import time:"]
         for module, load_time in analyzer.get_top_import_times():
-            print(f"  {module}: {load_time:.4f} seconds")
+            lines.append(f"  {module}: {load_time:.4f} seconds")
+        sys.stdout.write("\n".join(lines) + "\n")
 
 
 if __name__ == "__main__":
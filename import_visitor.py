@@ -1,14 +1,45 @@
 import ast
+from typing import Set
 
+# Statements whose bodies can hold further statements; imports can't appear anywhere else
+_BODY_NODES = frozenset(
+    {
+        ast.If,
+        ast.For,
+        ast.AsyncFor,
+        ast.While,
+        ast.With,
+        ast.AsyncWith,
+        ast.FunctionDef,
+        ast.AsyncFunctionDef,
+        ast.ClassDef,
+    }
+)
+_TRY_NODES = frozenset({ast.Try, getattr(ast, "TryStar", ast.Try)})
 
-class ImportVisitor(ast.NodeVisitor):
-    def __init__(self):
-        self.imports = set()
 
-    def visit_Import(self, node: ast.Import) -> None:
-        for name in node.names:
-            self.imports.add(name.name.split('.')[0])
-
-    def visit_ImportFrom(self, node: ast.ImportFrom) -> None:
-        if node.module:
-            self.imports.add(node.module.split('.')[0])
+def collect_imports(tree: ast.Module) -> Set[str]:
+    imports = set()
+    stack = list(tree.body)
+    while stack:
+        node = stack.pop()
+        node_type = type(node)
+        if node_type is ast.Import:
+            for alias in node.names:
+                imports.add(alias.name.partition(".")[0])
+        elif node_type is ast.ImportFrom:
+            if node.module:
+                imports.add(node.module.partition(".")[0])
+        elif node_type in _BODY_NODES:
+            stack.extend(node.body)
+            stack.extend(getattr(node, "orelse", ()))
+        elif node_type in _TRY_NODES:
+            stack.extend(node.body)
+            stack.extend(node.orelse)
+            stack.extend(node.finalbody)
+            for handler in node.handlers:
+                stack.extend(handler.body)
+        elif node_type is ast.Match:
+            for case in node.cases:
+                stack.extend(case.body)
+    return imports
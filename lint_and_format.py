@@ -1,10 +1,13 @@
 import subprocess
 import sys
+from concurrent.futures import ThreadPoolExecutor
 
 
 def get_changed_files():
     result = subprocess.run(
-        ["git", "diff", "--name-only", "--cached"], capture_output=True, text=True
+        ["git", "diff", "--name-only", "--cached", "--diff-filter=ACMR"],
+        capture_output=True,
+        text=True,
     )
     return [file for file in result.stdout.split("\n") if file.endswith(".py")]
 
@@ -17,36 +20,38 @@ def run_tool(tool, *args):
         return False, e.stdout, e.stderr
 
 
-def lint_and_format_file(file_path):
-    print(f"Processing {file_path}")
+def lint_and_format_files(file_paths):
+    print(f"Processing {', '.join(file_paths)}")
     errors_found = False
 
-    # Run isort
-    success, stdout, stderr = run_tool("isort", file_path)
+    # isort and Black both rewrite the files, so they run one after the other
+    success, stdout, stderr = run_tool("isort", *file_paths)
     if not success:
         print(f"Error running isort:\n{stderr}")
         errors_found = True
 
-    # Run Black
-    success, stdout, stderr = run_tool("black", file_path)
+    success, stdout, stderr = run_tool("black", *file_paths)
     if not success:
         print(f"Error running black:\n{stderr}")
         errors_found = True
 
-    # Run Ruff
-    success, stdout, stderr = run_tool("ruff", "check", file_path)
-    if not success:
-        print(f"Ruff found issues:\n{stdout}")
-        errors_found = True
+    # Ruff and MyPy only read the formatted files and can run side by side
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        ruff = executor.submit(run_tool, "ruff", "check", *file_paths)
+        mypy = executor.submit(run_tool, "mypy", *file_paths)
 
-    # Run MyPy
-    success, stdout, stderr = run_tool("mypy", file_path)
-    if not success:
-        print(f"MyPy found issues:\n{stdout}")
-        errors_found = True
+        success, stdout, stderr = ruff.result()
+        if not success:
+            print(f"Ruff found issues:\n{stdout}")
+            errors_found = True
+
+        success, stdout, stderr = mypy.result()
+        if not success:
+            print(f"MyPy found issues:\n{stdout}")
+            errors_found = True
 
     if not errors_found:
-        print(f"No issues found in {file_path}")
+        print("No issues found")
 
 
 def main():
@@ -56,8 +61,7 @@ def main():
         print("No Python files changed.")
         return
 
-    for file in changed_files:
-        lint_and_format_file(file)
+    lint_and_format_files(changed_files)
 
 
 if __name__ == "__main__":
@@ -1,5 +1,6 @@
 import argparse
 import os
+import sys
 
 from import_analyzer import ImportAnalyzer
 from visualizer import visualize_dependency_graph
@@ -36,29 +37,32 @@ def main():
     if args.load_times:
         analyzer.analyze_import_load_times()
     
-    print("Import Statistics:")
+    lines = ["Import Statistics:"]
     for module, stats in analyzer.get_import_statistics().items():
-        print(f"{module}:")
-        print(f"  Imports: {stats['imports']}")
-        print(f"  Imported by: {stats['imported_by']}")
-        print(f"  Stdlib imports: {stats.get('stdlib_imports', 0)}")
-        print(f"  Third-party imports: {stats.get('third-party_imports', 0)}")
-        print(f"  Local imports: {stats.get('local_imports', 0)}")
+        lines.append(f"{module}:")
+        lines.append(f"  Imports: {stats.imports}")
+        lines.append(f"  Imported by: {stats.imported_by}")
+        lines.append(f"  Stdlib imports: {stats.stdlib_imports}")
+        lines.append(f"  Third-party imports: {stats.third_party_imports}")
+        lines.append(f"  Local imports: {stats.local_imports}")
         if args.load_times:
-            print(f"  Import time: {stats['import_time']:.4f} seconds")
+            lines.append(f"  Import time: {stats.import_time:.4f} seconds")
     
-    print("\nOptimization Suggestions:")
-    for suggestion in analyzer.suggest_optimizations():
-        print(suggestion)
+    lines.append("\nOptimization Suggestions:")
+    lines.extend(analyzer.suggest_optimizations())
+    # One write for the report instead of a print() per line, done before the slow
+    # visualization step so a failure there doesn't lose it
+    sys.stdout.write("\n".join(lines) + "\n")
     
     if args.visualize:
-        visualize_dependency_graph(analyzer.import_graph, analyzer.module_stats)
-        print("\nDependency graph saved as 'dependency_graph.png'")
+        visualize_dependency_graph(analyzer.nx_graph, analyzer.module_stats, pos=analyzer.layout)
+        sys.stdout.write("\nDependency graph saved as 'dependency_graph.png'\n")
     
     if args.load_times:
-        print("\nTop 10 modules by import time:")
+        lines = ["\nTop 10 modules by import time:"]
         for module, load_time in analyzer.get_top_import_times():
-            print(f"  {module}: {load_time:.4f} seconds")
+            lines.append(f"  {module}: {load_time:.4f} seconds")
+        sys.stdout.write("\n".join(lines) + "\n")
 
 
 if __name__ == "__main__":
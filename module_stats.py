@@ -0,0 +1,11 @@
+from dataclasses import dataclass
+
+
+@dataclass(slots=True)
+class ModuleStats:
+    imports: int = 0
+    imported_by: int = 0
+    stdlib_imports: int = 0
+    third_party_imports: int = 0
+    local_imports: int = 0
+    import_time: float = 0.0
@@ -1,51 +1,55 @@
-from typing import Dict, List
+from typing import Dict, List, Optional
 
+import numpy as np
 
-def suggest_optimizations(module_stats: Dict[str, Dict]) -> List[str]:
-    suggestions = []
+from module_stats import ModuleStats
 
-    heavy_importers = {
-        module: stats["imports"]
-        for module, stats in module_stats.items()
-        if stats["imports"] > 10
-    }
 
-    if heavy_importers:
-        suggestions.append("Modules with many imports (consider refactoring):")
-        for module, count in sorted(heavy_importers.items(), key=lambda x: x[1], reverse=True):
-            suggestions.append(f"  - {module}: {count} imports")
+def suggest_optimizations(module_stats: Dict[str, ModuleStats]) -> List[str]:
+    suggestions = []
 
-    common_imports = {
-        module: stats["imported_by"]
-        for module, stats in module_stats.items()
-        if stats["imported_by"] > 5
-    }
+    names = np.array(list(module_stats), dtype=object)
+    # One sweep over the stats; columns are imports, imported_by, third-party, local
+    counts = np.fromiter(
+        (
+            (stats.imports, stats.imported_by, stats.third_party_imports, stats.local_imports)
+            for stats in module_stats.values()
+        ),
+        dtype=np.dtype((np.int32, 4)),
+        count=len(module_stats),
+    )
+    imports, imported_by, third_party, local = counts.T
+
+    def ranked(values: np.ndarray, threshold: int, limit: Optional[int] = None) -> np.ndarray:
+        idx = np.flatnonzero(values > threshold)
+        if limit is not None and idx.size > limit:
+            # Keep only candidates tied with or above the limit-th largest before sorting
+            kth = np.partition(values[idx], idx.size - limit)[idx.size - limit]
+            idx = idx[values[idx] >= kth]
+        return idx[np.argsort(-values[idx], kind="stable")][:limit]
+
+    heavy_idx = ranked(imports, 10)
+    if heavy_idx.size:
+        suggestions.append("Modules with many imports (consider refactoring):")
+        for i in heavy_idx:
+            suggestions.append(f"  - {names[i]}: {imports[i]} imports")
 
-    if common_imports:
+    common_idx = ranked(imported_by, 5)
+    if common_idx.size:
         suggestions.append("\nFrequently imported modules (consider lazy loading):")
-        for module, count in sorted(common_imports.items(), key=lambda x: x[1], reverse=True):
-            suggestions.append(f"  - {module}: imported by {count} modules")
-
-    third_party_imports = {
-        module: stats["third-party_imports"]
-        for module, stats in module_stats.items()
-        if stats.get("third-party_imports", 0) > 3
-    }
+        for i in common_idx:
+            suggestions.append(f"  - {names[i]}: imported by {imported_by[i]} modules")
 
-    if third_party_imports:
+    third_party_idx = ranked(third_party, 3, limit=5)
+    if third_party_idx.size:
         suggestions.append("\nConsider centralizing these frequently used third-party imports:")
-        for module, count in sorted(third_party_imports.items(), key=lambda x: x[1], reverse=True)[:5]:
-            suggestions.append(f"  - {module}: {count} third-party imports")
-
-    local_importers = {
-        module: stats.get("local_imports", 0)
-        for module, stats in module_stats.items()
-        if stats.get("local_imports", 0) > 5
-    }
+        for i in third_party_idx:
+            suggestions.append(f"  - {names[i]}: {third_party[i]} third-party imports")
 
-    if local_importers:
+    local_idx = ranked(local, 5, limit=5)
+    if local_idx.size:
         suggestions.append("\nConsider using __all__ to limit exported names in these modules:")
-        for module, count in sorted(local_importers.items(), key=lambda x: x[1], reverse=True)[:5]:
-            suggestions.append(f"  - {module}: {count} local imports")
+        for i in local_idx:
+            suggestions.append(f"  - {names[i]}: {local[i]} local imports")
 
     return suggestions
@@ -0,0 +1,82 @@
+import numpy as np
+
+try:
+    from numba import njit
+
+    HAVE_NUMBA = True
+except ImportError:
+    HAVE_NUMBA = False
+
+    def njit(*args, **kwargs):
+        def decorator(func):
+            return func
+
+        return decorator
+
+
+@njit(cache=True)
+def tarjan_scc(indptr: np.ndarray, indices: np.ndarray) -> np.ndarray:
+    n = indptr.shape[0] - 1
+    index = np.full(n, -1, dtype=np.int32)
+    lowlink = np.zeros(n, dtype=np.int32)
+    on_stack = np.zeros(n, dtype=np.bool_)
+    comp_id = np.full(n, -1, dtype=np.int32)
+
+    # Tarjan's node stack plus an explicit call stack of (node, next edge) frames
+    stack = np.empty(n, dtype=np.int32)
+    call_node = np.empty(n, dtype=np.int32)
+    call_edge = np.empty(n, dtype=np.int32)
+    sp = 0
+    counter = 0
+    n_comp = 0
+
+    for root in range(n):
+        if index[root] != -1:
+            continue
+
+        index[root] = counter
+        lowlink[root] = counter
+        counter += 1
+        stack[sp] = root
+        sp += 1
+        on_stack[root] = True
+        call_node[0] = root
+        call_edge[0] = indptr[root]
+        cp = 1
+
+        while cp > 0:
+            v = call_node[cp - 1]
+            e = call_edge[cp - 1]
+            if e < indptr[v + 1]:
+                call_edge[cp - 1] = e + 1
+                w = indices[e]
+                if index[w] == -1:
+                    index[w] = counter
+                    lowlink[w] = counter
+                    counter += 1
+                    stack[sp] = w
+                    sp += 1
+                    on_stack[w] = True
+                    call_node[cp] = w
+                    call_edge[cp] = indptr[w]
+                    cp += 1
+                elif on_stack[w] and index[w] < lowlink[v]:
+                    lowlink[v] = index[w]
+                continue
+
+            cp -= 1
+            if lowlink[v] == index[v]:
+                while True:
+                    sp -= 1
+                    w = stack[sp]
+                    on_stack[w] = False
+                    comp_id[w] = n_comp
+                    if w == v:
+                        break
+                n_comp += 1
+            if cp > 0:
+                u = call_node[cp - 1]
+                if lowlink[v] < lowlink[u]:
+                    lowlink[u] = lowlink[v]
+
+    return comp_id
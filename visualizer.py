@@ -1,27 +1,38 @@
-from typing import Dict, Set, Tuple
+from collections import defaultdict
+from typing import TYPE_CHECKING, Dict, List, Optional, Tuple
 
-import matplotlib.cm as cm
-import matplotlib.pyplot as plt
-import networkx as nx
-from matplotlib.colors import LinearSegmentedColormap
+from module_stats import ModuleStats
+
+if TYPE_CHECKING:
+    import networkx as nx
+
+
+def compute_layout(G: "nx.DiGraph") -> Dict[str, Tuple[float, float]]:
+    import networkx as nx
+
+    try:
+        from networkx.drawing.nx_agraph import graphviz_layout
+
+        return graphviz_layout(G, prog="sfdp")
+    except ImportError:
+        return nx.spring_layout(G, seed=42, iterations=30)
 
 
 def visualize_dependency_graph(
-    import_graph: Dict[str, Set[Tuple[str, str]]],
-    module_stats: Dict[str, Dict],
+    G: "nx.DiGraph",
+    module_stats: Dict[str, ModuleStats],
     output_file: str = "dependency_graph.png",
+    pos: Optional[Dict[str, Tuple[float, float]]] = None,
 ) -> None:
-    G = nx.DiGraph()
-    for module, imports in import_graph.items():
-        G.add_node(module, import_time=module_stats[module]["import_time"])
-        for imported_module, import_type in imports:
-            G.add_edge(module, imported_module, type=import_type)
+    import matplotlib.pyplot as plt
+    import networkx as nx
 
     fig, ax = plt.subplots(figsize=(20, 20))
-    pos = nx.spring_layout(G)
+    if pos is None:
+        pos = compute_layout(G)
 
     # Draw nodes with color based on import time
-    node_colors = [G.nodes[node]["import_time"] for node in G.nodes()]
+    node_colors = [module_stats[node].import_time for node in G.nodes()]
     cmap = plt.get_cmap("YlOrRd")
     nx.draw_networkx_nodes(G, pos, node_size=1000, node_color=node_colors, cmap=cmap, ax=ax)
 
@@ -30,9 +41,12 @@ def visualize_dependency_graph(
 
     # Draw edges
     edge_colors = {"stdlib": "green", "third-party": "red", "local": "blue"}
+    edges_by_type: Dict[str, List[Tuple[str, str]]] = defaultdict(list)
     for u, v, d in G.edges(data=True):
+        edges_by_type[d["type"]].append((u, v))
+    for import_type, edgelist in edges_by_type.items():
         nx.draw_networkx_edges(
-            G, pos, edgelist=[(u, v)], edge_color=edge_colors[d["type"]], arrows=True, ax=ax
+            G, pos, edgelist=edgelist, edge_color=edge_colors[import_type], arrows=True, ax=ax
         )
 
     ax.set_title("Project Dependency Graph (Node color indicates import time)")